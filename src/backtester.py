@@ -3,15 +3,25 @@ import numpy as np
 import logging
 from datetime import datetime
 
+try:
+    from backtester_kernel import _run
+    from portfolio import INSUFFICIENT_CASH_MESSAGE
+except ImportError:
+    from .backtester_kernel import _run
+    from .portfolio import INSUFFICIENT_CASH_MESSAGE
+
 logger = logging.getLogger(__name__)
 
 class Backtester:
     def __init__(self, portfolio, prices):
         """Initialize backtester with portfolio and price data"""
         self.portfolio = portfolio
-        self.prices = prices.copy()  # Make a copy to avoid modifications
+        self.prices = prices  # Only read, never modified
+        self.close_prices = prices['Close'].to_numpy(dtype=np.float64)
+        self.close_prices.flags.writeable = False  # Guard the shared price buffer
         self.strategies = {}
         self.trading_days = prices.index  # Use all price dates as trading days
+        self.is_first_of_month = np.asarray(self.trading_days.day == 1)  # Shared by all strategies
 
     def run_backtest(self, strategy_data: pd.DataFrame, strategy_name: str) -> None:
         """Run backtest for a single strategy"""
@@ -20,91 +30,77 @@ class Backtester:
             if strategy_data.empty:
                 raise ValueError(f"Empty strategy data for {strategy_name}")
             
-            strategy_data = strategy_data.copy()  # Make a copy to avoid modifications
-            strategy_data['Date'] = pd.to_datetime(strategy_data['Date'])
-            strategy_data.set_index('Date', inplace=True)
+            # Dates are usually parsed already by read_csv(parse_dates=...)
+            trade_dates = strategy_data['Date']
+            if not pd.api.types.is_datetime64_any_dtype(trade_dates):
+                trade_dates = pd.to_datetime(trade_dates)
+            trade_dates = pd.DatetimeIndex(trade_dates)
             
             # Initialize strategy and data validation
-            self.portfolio.initialize_strategy(strategy_name)
+            sid = self.portfolio.initialize_strategy(strategy_name)
             
-            # Initialize results storage
-            self.strategies[strategy_name] = {
-                'portfolio_values': [],  # Will store total value (cash + positions)
-                'position_values': [],   # Will store only position values
-                'cash_values': [],       # Will store only cash values
-                'returns': [],
-                'dates': []
-            }
+            close = self.close_prices
+            is_first_of_month = self.is_first_of_month
+            n_days = len(self.trading_days)
+            
+            # Map trades onto the trading calendar (trades on non-trading days are ignored)
+            trade_idx = self.trading_days.get_indexer(trade_dates)
+            matched = trade_idx >= 0
+            has_trade = np.zeros(n_days, dtype=bool)
+            has_trade[trade_idx[matched]] = True
+            trade_amount = np.zeros(n_days, dtype=np.float64)
+            np.add.at(trade_amount, trade_idx[matched],
+                      strategy_data['Amount'].to_numpy(dtype=np.float64)[matched])
             
-            # Initialize tracking variables
-            prev_value = self.portfolio.initial_amount  # Start with initial cash
+            # Record monthly contributions up front; the kernel adds this strategy's cash
+            contributed = np.zeros(n_days, dtype=bool)
+            for i in np.flatnonzero(is_first_of_month):
+                due = self.portfolio.add_monthly_contribution(self.trading_days[i], deferred_sid=sid)
+                contributed[i] = due[sid]
+            init_cash = self.portfolio.strategy_cash[sid]
+            init_shares = self.portfolio.positions[sid]
             
-            # Process each trading day
-            for current_date in self.trading_days:
-                try:
-                    # Handle monthly contribution
-                    if current_date.day == 1:
-                        pre_contrib_value = self.portfolio.calculate_value(
-                            self.prices.loc[current_date, 'Close'],
-                            strategy_name
-                        )
-                        self.portfolio.add_monthly_contribution(current_date)
-                    
-                    # Execute trades if any
-                    if current_date in strategy_data.index:
-                        trade_amount = strategy_data.loc[current_date, 'Amount']
-                        current_price = self.prices.loc[current_date, 'Close']
-                        try:
-                            self.portfolio.execute_trade(
-                                amount=trade_amount,
-                                date=current_date,
-                                strategy_name=strategy_name,
-                                price=current_price
-                            )
-                        except ValueError as e:
-                            logger.warning(f"Trade skipped for {strategy_name} on {current_date}: {str(e)}")
-                    
-                    # Calculate current values
-                    current_price = self.prices.loc[current_date, 'Close']
-                    position_value = self.portfolio.positions[strategy_name] * current_price
-                    cash_value = self.portfolio.strategy_cash[strategy_name]
-                    current_total_value = position_value + cash_value
-                    
-                    # Calculate return (handling contribution days specially)
-                    if current_date.day == 1 and len(self.strategies[strategy_name]['dates']) > 0:
-                        daily_return = (current_total_value - self.portfolio.monthly_contribution) / pre_contrib_value - 1
-                    else:
-                        daily_return = (current_total_value / prev_value - 1) if prev_value > 0 else 0
-                    
-                    # Store all values
-                    self.strategies[strategy_name]['dates'].append(current_date)
-                    self.strategies[strategy_name]['portfolio_values'].append(current_total_value)
-                    self.strategies[strategy_name]['position_values'].append(position_value)
-                    self.strategies[strategy_name]['cash_values'].append(cash_value)
-                    self.strategies[strategy_name]['returns'].append(daily_return)
-                    
-                    prev_value = current_total_value
-                    
-                    logger.debug(
-                        f"{strategy_name} on {current_date}: "
-                        f"Cash={cash_value:.2f}, "
-                        f"Position={position_value:.2f}, "
-                        f"Total={current_total_value:.2f}"
-                    )
-                    
-                except Exception as day_error:
-                    logger.error(f"Error on {current_date} for {strategy_name}: {str(day_error)}")
-                    continue
+            # Run the day-by-day simulation
+            (portfolio_values, position_values, cash_values, returns,
+             skipped_trades, final_cash, final_shares) = _run(
+                close, is_first_of_month, contributed, trade_amount, has_trade,
+                float(init_cash), float(init_shares),
+                float(self.portfolio.initial_amount),
+                float(self.portfolio.monthly_contribution)
+            )
+            self.portfolio.strategy_cash[sid] = final_cash
+            self.portfolio.positions[sid] = final_shares
             
-            # Convert lists to numpy arrays
-            for key in ['portfolio_values', 'position_values', 'cash_values', 'returns']:
-                self.strategies[strategy_name][key] = np.array(self.strategies[strategy_name][key])
-            self.strategies[strategy_name]['dates'] = pd.DatetimeIndex(self.strategies[strategy_name]['dates'])
+            for i in np.flatnonzero(skipped_trades):
+                logger.warning(
+                    "Trade skipped for %s on %s: " + INSUFFICIENT_CASH_MESSAGE,
+                    strategy_name, self.trading_days[i], strategy_name, trade_amount[i]
+                )
+            
+            self.strategies[strategy_name] = {
+                'portfolio_values': portfolio_values,
+                'position_values': position_values,
+                'cash_values': cash_values,
+                'returns': returns,
+                'dates': self.trading_days
+            }
             
         except Exception as e:
-            logger.error(f"Error in backtesting {strategy_name}: {str(e)}")
+            logger.error("Error in backtesting %s: %s", strategy_name, e)
             raise
 
+    def merge_strategy(self, strategy_name: str, results: dict) -> None:
+        """
+        Add the results of a strategy backtested by another Backtester
+        
+        Args:
+            strategy_name: String identifier for the strategy
+            results: Strategy results returned by get_strategy_results
+        """
+        if not results['dates'].equals(self.trading_days):
+            raise ValueError(f"Results for {strategy_name} use different trading days")
+        self.strategies[strategy_name] = results
+
     def get_strategy_results(self, strategy_name):
         """
         Get results for a specific strategy
@@ -0,0 +1,106 @@
+import numpy as np
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Compiling costs about 1 s per process (0.35 s when loaded from numba's on-disk
+# cache) while the Python loop takes about 0.6 us per day, so only very long
+# series are worth handing to numba
+JIT_MIN_DAYS = 1_000_000
+
+# numba's cache files are named after the source file but record the module
+# name, so only the top-level name main.py and the tests import may use them
+_CACHE_JIT = __name__ == 'backtester_kernel'
+
+
+def _run(close, is_first_of_month, contributed, trade_amount, has_trade,
+         init_cash, init_shares, initial_amount, monthly_contrib):
+    """Run the simulation, compiled with numba for series of at least JIT_MIN_DAYS"""
+    kernel = _simulate
+    if close.shape[0] >= JIT_MIN_DAYS:
+        kernel = _compiled_simulate() or _simulate
+    return kernel(close, is_first_of_month, contributed, trade_amount, has_trade,
+                  init_cash, init_shares, initial_amount, monthly_contrib)
+
+
+@lru_cache(maxsize=None)
+def _compiled_simulate():
+    """Compile _simulate with numba on first use, or return None without numba"""
+    try:
+        from numba import njit
+    except ImportError:
+        logger.debug("numba not available, backtest kernel will run in pure Python")
+        return None
+    return njit(cache=_CACHE_JIT)(_simulate)
+
+
+def _simulate(close, is_first_of_month, contributed, trade_amount, has_trade,
+              init_cash, init_shares, initial_amount, monthly_contrib):
+    """
+    Simulate one strategy day by day
+
+    Args:
+        close: Closing price per trading day
+        is_first_of_month: True on days that start a new month
+        contributed: True on days the strategy receives a monthly contribution
+        trade_amount: Dollar amount to invest per trading day
+        has_trade: True on days with a trade signal
+        init_cash: Strategy cash before the first day
+        init_shares: Strategy position (in shares) before the first day
+        initial_amount: Portfolio initial amount, used as the first day's reference value
+        monthly_contrib: Monthly contribution amount
+
+    Returns:
+        tuple of (portfolio_values, position_values, cash_values, returns,
+        skipped_trades, final_cash, final_shares)
+    """
+    n_days = close.shape[0]
+    portfolio_values = np.empty(n_days, dtype=np.float64)
+    position_values = np.empty(n_days, dtype=np.float64)
+    cash_values = np.empty(n_days, dtype=np.float64)
+    returns = np.empty(n_days, dtype=np.float64)
+    skipped_trades = np.zeros(n_days, dtype=np.bool_)
+
+    cash = init_cash
+    shares = init_shares
+    prev_value = initial_amount
+    pre_contrib_value = initial_amount
+
+    for i in range(n_days):
+        price = close[i]
+
+        # Handle monthly contribution
+        if is_first_of_month[i]:
+            pre_contrib_value = shares * price + cash
+            if contributed[i]:
+                cash += monthly_contrib
+
+        # Execute trade if there is enough cash
+        if has_trade[i]:
+            if trade_amount[i] > cash:
+                skipped_trades[i] = True
+            else:
+                cash -= trade_amount[i]
+                shares += trade_amount[i] / price
+
+        position_value = shares * price
+        total_value = position_value + cash
+
+        # Calculate return (handling contribution days specially)
+        if is_first_of_month[i] and i > 0:
+            daily_return = (total_value - monthly_contrib) / pre_contrib_value - 1
+        elif prev_value > 0:
+            daily_return = total_value / prev_value - 1
+        else:
+            daily_return = 0.0
+
+        portfolio_values[i] = total_value
+        position_values[i] = position_value
+        cash_values[i] = cash
+        returns[i] = daily_return
+
+        prev_value = total_value
+
+    return (portfolio_values, position_values, cash_values, returns,
+            skipped_trades, cash, shares)
@@ -1,5 +1,8 @@
+import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from backtester import Backtester
 from portfolio import Portfolio
 from metrics import PerformanceMetrics
@@ -9,6 +12,24 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Starting a process pool costs tens of milliseconds while one backtest of the
+# bundled data takes about 5 ms, so only this many strategies run in parallel
+PARALLEL_MIN_STRATEGIES = 16
+
+def _load_prices(prices_path):
+    """Load daily closing prices sorted by date"""
+    prices = pd.read_csv(prices_path, parse_dates=['Date'], index_col='Date')
+    return prices.sort_index()  # Ensure data is sorted by date
+
+def _run_one(prices, strategy_path, strategy_name, initial_amount, monthly_contribution):
+    """Backtest a single strategy in its own Portfolio and return pickleable state"""
+    portfolio = Portfolio(initial_amount, monthly_contribution)
+    backtester = Backtester(portfolio, prices)
+    strategy_data = pd.read_csv(strategy_path, parse_dates=['Date'])
+    strategy_data = strategy_data.sort_values('Date')
+    backtester.run_backtest(strategy_data, strategy_name)
+    return backtester.get_strategy_results(strategy_name), portfolio.get_strategy_state(strategy_name)
+
 def main():
     # Create necessary directories
     Path("reports").mkdir(exist_ok=True)
@@ -20,14 +41,14 @@ def main():
     portfolio = Portfolio(initial_amount, monthly_contribution)
 
     # Load and validate daily closing prices
+    prices_path = 'data/prices.csv'
     try:
-        prices = pd.read_csv('data/prices.csv', parse_dates=['Date'], index_col='Date')
-        prices = prices.sort_index()  # Ensure data is sorted by date
+        prices = _load_prices(prices_path)
     except FileNotFoundError:
         logger.error("Error: prices.csv not found in data directory")
         return
     except Exception as e:
-        logger.error(f"Error loading prices data: {e}")
+        logger.error("Error loading prices data: %s", e)
         return
 
     # Initialize components
@@ -43,17 +64,40 @@ def main():
         logger.warning("No strategy files found in data/strategies directory")
         return
 
+    # Strategies are independent, so many of them are backtested in parallel
+    worker_results = {}
+    max_workers = min(len(strategies), os.cpu_count() or 1)
+    if len(strategies) < PARALLEL_MIN_STRATEGIES or max_workers == 1:
+        for strategy in strategies:
+            try:
+                worker_results[strategy] = _run_one(
+                    prices, f'data/strategies/{strategy}.csv', strategy,
+                    initial_amount, monthly_contribution
+                )
+            except Exception as e:
+                logger.error("Error processing strategy %s: %s", strategy, e)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _run_one, prices, f'data/strategies/{strategy}.csv', strategy,
+                    initial_amount, monthly_contribution
+                ): strategy
+                for strategy in strategies
+            }
+            for future in as_completed(futures):
+                strategy = futures[future]
+                try:
+                    worker_results[strategy] = future.result()
+                except Exception as e:
+                    logger.error("Error processing strategy %s: %s", strategy, e)
+
+    # Merge in file order so results do not depend on completion order
     for strategy in strategies:
-        try:
-            strategy_data = pd.read_csv(
-                f'data/strategies/{strategy}.csv', 
-                parse_dates=['Date']
-            )
-            strategy_data = strategy_data.sort_values('Date')
-            backtester.run_backtest(strategy_data, strategy)
-        except Exception as e:
-            logger.error(f"Error processing strategy {strategy}: {e}")
-            continue
+        if strategy in worker_results:
+            results, state = worker_results[strategy]
+            backtester.merge_strategy(strategy, results)
+            portfolio.merge_strategy(strategy, state)
 
     # Calculate performance metrics using backtester results
     metrics = metrics_calculator.calculate_metrics(backtester.get_all_results(), portfolio)
@@ -65,24 +109,24 @@ def main():
         return
 
     # Get dates from first strategy (all strategies should have same dates)
-    dates = strategy_results[list(strategy_results.keys())[0]]['dates']
+    strategy_names = list(strategy_results.keys())
+    dates = strategy_results[strategy_names[0]]['dates']
+    if not all(data['dates'].equals(dates) for data in strategy_results.values()):
+        logger.error("Strategy results do not share the same trading dates")
+        return
 
     # Create DataFrames for visualization
-    asset_values_df = pd.DataFrame({
-        strategy: pd.Series(
-            data['portfolio_values'],  # This contains cash + position values
-            index=data['dates']
-        )
-        for strategy, data in strategy_results.items()
-    })
-
-    returns_df = pd.DataFrame({
-        strategy: pd.Series(
-            data['returns'],
-            index=data['dates']
-        )
-        for strategy, data in strategy_results.items()
-    })
+    asset_values_df = pd.DataFrame(
+        np.column_stack([data['portfolio_values'] for data in strategy_results.values()]),  # Cash + position values
+        index=dates,
+        columns=strategy_names
+    )
+
+    returns_df = pd.DataFrame(
+        np.column_stack([data['returns'] for data in strategy_results.values()]),
+        index=dates,
+        columns=strategy_names
+    )
 
     # Get deposits history for cash-only portfolio visualization
     deposits_df = portfolio.get_contribution_history()
@@ -92,12 +136,13 @@ def main():
     save_path = f"reports/{plot_filename}"
 
     # Add debug logging
-    logger.debug("Creating visualization with:")
-    for strategy in strategy_results:
-        logger.debug(f"{strategy} final values:")
-        logger.debug(f"  Cash: {strategy_results[strategy]['cash_values'][-1]:.2f}")
-        logger.debug(f"  Position: {strategy_results[strategy]['position_values'][-1]:.2f}")
-        logger.debug(f"  Total: {strategy_results[strategy]['portfolio_values'][-1]:.2f}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Creating visualization with:")
+        for strategy in strategy_results:
+            logger.debug(f"{strategy} final values:")
+            logger.debug(f"  Cash: {strategy_results[strategy]['cash_values'][-1]:.2f}")
+            logger.debug(f"  Position: {strategy_results[strategy]['position_values'][-1]:.2f}")
+            logger.debug(f"  Total: {strategy_results[strategy]['portfolio_values'][-1]:.2f}")
 
     visualizer.create_analysis_plots(
         deposits=deposits_df,
@@ -107,6 +152,7 @@ def main():
         strategies=strategies,
         save_path=save_path
     )
+    visualizer.close()  # The figure is only reused within one process
 
     # Only generate report if plots were created successfully
     report = generate_markdown_report(portfolio, metrics)
@@ -1,6 +1,6 @@
 import numpy as np
-import numpy_financial as npf  # Add this import
 import pandas as pd
+from scipy.optimize import brentq
 from typing import Dict, List, Union
 from datetime import datetime
 import logging
@@ -26,8 +26,7 @@ class PerformanceMetrics:
         
         # Calculate total contributions
         total_contributions = portfolio.initial_amount
-        if portfolio.contributions:
-            total_contributions += sum(c['amount'] for c in portfolio.contributions)
+        total_contributions += sum(portfolio.contributions['amount'])
         
         for strategy_name, data in strategy_results.items():
             metrics[strategy_name] = {
@@ -62,16 +61,15 @@ class PerformanceMetrics:
         Calculate money-weighted return using IRR
         """
         try:
-            if not portfolio.contributions:
+            amounts = portfolio.contributions['amount']
+            if not amounts:
                 return np.nan
                 
             # Create cashflows array (negative for contributions, positive for final value)
-            cashflows = [-c['amount'] for c in portfolio.contributions]
-            cashflows.append(final_value)
-            cashflows = np.array(cashflows)
+            cashflows = np.append(-np.asarray(amounts, dtype=np.float64), final_value)
             
-            # Calculate IRR using numpy_financial
-            irr = npf.irr(cashflows)
+            # Calculate IRR by root-finding on the cashflows' value
+            irr = self._solve_irr(cashflows)
             
             # Convert to annual rate and handle edge cases
             if np.isnan(irr) or np.isinf(irr):
@@ -80,14 +78,42 @@ class PerformanceMetrics:
             # Convert to percentage
             annual_rate = (1 + irr) ** 12 - 1
             
-            logger.debug(f"IRR calculation - Cashflows: {cashflows}, IRR: {irr}, Annual: {annual_rate}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"IRR calculation - Cashflows: {cashflows}, IRR: {irr}, Annual: {annual_rate}")
             
             return annual_rate
             
         except Exception as e:
-            logger.error(f"Error calculating IRR: {str(e)}")
+            logger.error("Error calculating IRR: %s", e)
             return np.nan
 
+    @staticmethod
+    def _solve_irr(cashflows: np.ndarray, low: float = -0.99, high: float = 10.0) -> float:
+        """
+        Find the periodic rate at which the cashflows' value is zero
+
+        Args:
+            cashflows: Cashflows per period, starting at period 0
+            low: Lower bound of the rate bracket
+            high: Upper bound of the rate bracket
+
+        Returns:
+            float: IRR per period, or NaN if the bracket holds no sign change
+            (no IRR above low, or an even number of IRRs such as [-100, 230, -132])
+        """
+        # Value at the last period has the same roots as NPV but avoids
+        # dividing by tiny discount factors near the lower bound
+        periods_left = np.arange(len(cashflows) - 1, -1, -1)
+
+        def future_value(rate):
+            with np.errstate(over='ignore'):
+                return np.sum(cashflows * (1 + rate) ** periods_left)
+
+        f_low, f_high = future_value(low), future_value(high)
+        if np.isnan(f_low) or np.isnan(f_high) or np.sign(f_low) == np.sign(f_high):
+            return np.nan
+        return brentq(future_value, low, high)
+
     def _calculate_sharpe_ratio(self, returns: np.ndarray) -> float:
         """Calculate annualized Sharpe ratio"""
         if len(returns) <= 1:
@@ -105,16 +131,10 @@ class PerformanceMetrics:
 
     def _calculate_max_drawdown(self, values: np.ndarray) -> float:
         """Calculate maximum drawdown"""
-        peak = values[0]
-        max_dd = 0
-        
-        for value in values:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak
-            max_dd = max(max_dd, dd)
-            
-        return max_dd
+        values = np.asarray(values, dtype=np.float64)
+        peaks = np.maximum.accumulate(values)
+        drawdowns = (peaks - values) / peaks
+        return max(float(drawdowns.max()), 0.0)
 
     def _get_empty_metrics(self) -> Dict[str, float]:
         """Return dictionary with NaN values for all metrics"""
@@ -143,6 +163,5 @@ class PerformanceMetrics:
 
     def _calculate_rolling_sharpe(self, returns: pd.Series, window: int) -> pd.Series:
         """Calculate rolling Sharpe ratio"""
-        return returns.rolling(window).apply(
-            lambda x: np.sqrt(252) * x.mean() / x.std() if len(x) > 1 else np.nan
-        )
\ No newline at end of file
+        rolling = returns.rolling(window)
+        return np.sqrt(252) * rolling.mean() / rolling.std()
\ No newline at end of file
@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
+import numpy as np
 import pandas as pd
 from typing import Dict, List
 from pathlib import Path
@@ -16,6 +17,10 @@ class PortfolioVisualizer:
         self.title_fontsize = 20    # Main title font size
         self.subtitle_fontsize = 14  # Subplot titles font size
         self.label_fontsize = 12    # Axis labels font size
+        self.dpi = 150              # Output resolution
+        self.max_points = 2000      # Max points per line, enough for the output width
+        self._fig = None            # Figure reused across runs
+        self._axes = None
 
     def create_analysis_plots(self, 
                             deposits: pd.DataFrame,
@@ -26,8 +31,13 @@ class PortfolioVisualizer:
                             save_path: str = 'reports/portfolio_analysis.png') -> None:
         """Create and save four-panel analysis plot"""
         try:
-            # Create figure with subplots
-            fig, axes = plt.subplots(4, 1, figsize=self.figsize)
+            # Create figure with subplots once, then clear it on later runs
+            if self._fig is None:
+                self._fig, self._axes = plt.subplots(4, 1, figsize=self.figsize)
+            else:
+                for ax in self._axes:
+                    ax.clear()
+            fig, axes = self._fig, self._axes
             
             # Add main title with larger font and more space
             fig.suptitle('Portfolio Analysis', 
@@ -42,20 +52,33 @@ class PortfolioVisualizer:
             self._plot_asset_prices(prices, axes[3])
 
             # Adjust spacing between subplots
-            plt.subplots_adjust(hspace=0.35)  # Increase space between subplots
+            fig.subplots_adjust(hspace=0.35)  # Increase space between subplots
             
             # Ensure directory exists and save plot
             Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-            plt.savefig(save_path, bbox_inches='tight', dpi=300)
-            plt.close()
+            fig.savefig(save_path, bbox_inches='tight', dpi=self.dpi)
             
             return True
             
         except Exception as e:
-            logger.error(f"Error creating plots: {str(e)}")
-            plt.close()
+            logger.error("Error creating plots: %s", e)
+            self.close()
             return False
 
+    def close(self):
+        """Release the reused figure"""
+        if self._fig is not None:
+            plt.close(self._fig)
+            self._fig = None
+            self._axes = None
+
+    def _downsample(self, data):
+        """Keep at most roughly max_points evenly spaced rows for plotting, always including the last one"""
+        step = -(-len(data) // self.max_points)  # Ceiling division
+        if step <= 1:
+            return data
+        return data.iloc[np.unique(np.r_[0:len(data):step, len(data) - 1])]
+
     @staticmethod
     def _format_currency_k(x, p):
         """Helper function to format currency in thousands"""
@@ -88,11 +111,13 @@ class PortfolioVisualizer:
 
     def _plot_portfolio_values(self, asset_values: pd.DataFrame, strategies: List[str], ax):
         """Plot portfolio values for each strategy"""
+        asset_values = self._downsample(asset_values)
         for strategy in strategies:
             ax.plot(
                 asset_values.index, 
                 asset_values[strategy],
-                label=f'Strategy: {strategy}'  # 修改标签显示
+                label=f'Strategy: {strategy}',  # 修改标签显示
+                rasterized=True
             )
         
         # Format y-axis to show thousands with K
@@ -112,11 +137,11 @@ class PortfolioVisualizer:
 
     def _plot_time_weighted_returns(self, returns: pd.DataFrame, strategies: List[str], ax):
         """Plot time-weighted returns"""
+        # Calculate cumulative returns for all strategies in one pass
+        cumulative_returns = self._downsample((1 + returns[strategies]).cumprod() - 1)
         for strategy in strategies:
-            # Calculate cumulative returns
-            cumulative_returns = (1 + returns[strategy]).cumprod() - 1
-            ax.plot(returns.index, cumulative_returns * 100,
-                   label=f'Strategy: {strategy}')  # 修改标签显示
+            ax.plot(cumulative_returns.index, cumulative_returns[strategy].to_numpy() * 100,
+                   label=f'Strategy: {strategy}', rasterized=True)  # 修改标签显示
         
         ax.set_title('Time-weighted Returns', 
                     fontsize=self.subtitle_fontsize,
@@ -130,7 +155,8 @@ class PortfolioVisualizer:
 
     def _plot_asset_prices(self, prices: pd.DataFrame, ax):
         """Plot asset prices"""
-        ax.plot(prices.index, prices['Close'], 'k-', label='Asset Price')
+        prices = self._downsample(prices)
+        ax.plot(prices.index, prices['Close'], 'k-', label='Asset Price', rasterized=True)
         ax.set_title('Asset Price History', 
                     fontsize=self.subtitle_fontsize,
                     pad=15)
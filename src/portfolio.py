@@ -1,136 +1,221 @@
+import numpy as np
 import pandas as pd
 import logging
 from datetime import datetime
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Shared by execute_trade and the backtester's skipped-trade warning
+INSUFFICIENT_CASH_MESSAGE = "Insufficient cash for trade in %s: %s"
+
 class Portfolio:
     def __init__(self, initial_amount: float, monthly_contribution: float):
         """Initialize portfolio with initial amount and monthly contribution"""
         self.initial_amount = initial_amount
         self.monthly_contribution = monthly_contribution
-        self.positions = {}  # Strategy positions
-        self.strategy_cash = {}  # Strategy cash balances
+        self.strategy_ids = {}  # Strategy name -> index into the state arrays
+        self.positions = np.zeros(0)  # Strategy positions, by strategy id
+        self.strategy_cash = np.zeros(0)  # Strategy cash balances, by strategy id
         self.strategy_contributions = {}  # Track contributions per strategy
-        self.contributions = []  # Track overall contributions
-        self.last_contribution_dates = {}  # Track last contribution date per strategy
+        self.contributions = self._empty_contributions()  # Track overall contributions
+        self.strategy_names = []  # Strategy id -> name
+        self.last_contribution_months = np.zeros(0, dtype=np.int64)  # Last funded month id per strategy, -1 if none
 
-    def initialize_strategy(self, strategy_name: str) -> None:
-        """Initialize a new strategy with initial cash"""
-        if strategy_name not in self.strategy_cash:
-            logger.info(f"Initializing strategy: {strategy_name}")
-            self.positions[strategy_name] = 0.0
-            self.strategy_cash[strategy_name] = self.initial_amount
-            self.strategy_contributions[strategy_name] = []
-            self.last_contribution_dates[strategy_name] = None
+    def initialize_strategy(self, strategy_name: str) -> int:
+        """
+        Initialize a new strategy with initial cash
+        
+        Args:
+            strategy_name: Strategy identifier
+            
+        Returns:
+            int: Strategy id used to index positions and strategy_cash
+        """
+        if strategy_name not in self.strategy_ids:
+            logger.info("Initializing strategy: %s", strategy_name)
+            self.strategy_ids[strategy_name] = len(self.strategy_ids)
+            self.positions = np.append(self.positions, 0.0)
+            self.strategy_cash = np.append(self.strategy_cash, float(self.initial_amount))
+            self.strategy_names.append(strategy_name)
+            self.strategy_contributions[strategy_name] = self._empty_contributions()
+            self.last_contribution_months = np.append(self.last_contribution_months, -1)
+        return self.strategy_ids[strategy_name]
+
+    def _check_strategy_id(self, sid: int) -> None:
+        """Raise if sid does not refer to an initialized strategy"""
+        if not 0 <= sid < len(self.strategy_ids):
+            raise ValueError(f"Strategy id {sid} not initialized")
 
-    def execute_trade(self, amount: float, date: datetime, strategy_name: str, price: float) -> None:
+    def execute_trade(self, amount: float, date: datetime, sid: int, price: float) -> None:
         """
         Execute a trade for a specific strategy
         
         Args:
             amount: Dollar amount to invest
             date: Trade date
-            strategy_name: Strategy identifier
+            sid: Strategy id returned by initialize_strategy
             price: Asset price on trade date
         """
-        if strategy_name not in self.strategy_cash:
-            raise ValueError(f"Strategy {strategy_name} not initialized")
+        self._check_strategy_id(sid)
         
-        if amount > self.strategy_cash[strategy_name]:
-            raise ValueError(f"Insufficient cash for trade in {strategy_name}: {amount}")
+        if amount > self.strategy_cash[sid]:
+            raise ValueError(INSUFFICIENT_CASH_MESSAGE % (self.strategy_names[sid], amount))
         
         # Calculate shares to buy based on dollar amount
         shares = amount / price
         
         # Update cash and positions
-        self.strategy_cash[strategy_name] -= amount
-        self.positions[strategy_name] += shares
-        
-        logger.debug(
-            f"Trade executed for {strategy_name} on {date}: "
-            f"Amount=${amount:.2f}, "
-            f"Price=${price:.2f}, "
-            f"Shares={shares:.4f}"
-        )
+        self.strategy_cash[sid] -= amount
+        self.positions[sid] += shares
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Trade executed for {self.strategy_names[sid]} on {date}: "
+                f"Amount=${amount:.2f}, "
+                f"Price=${price:.2f}, "
+                f"Shares={shares:.4f}"
+            )
+
+    @staticmethod
+    def _empty_contributions() -> dict:
+        """Create empty contribution records, stored as one list per column"""
+        return {'Date': [], 'amount': [], 'cumulative': []}
 
-    def add_monthly_contribution(self, date: datetime) -> None:
-        """Add monthly contribution to each strategy independently"""
-        for strategy_name in self.strategy_cash:
-            # Check if this strategy needs a contribution this month
-            last_date = self.last_contribution_dates[strategy_name]
-            if (last_date is None or
-                (date.year, date.month) > (last_date.year, last_date.month)):
-                
-                # Add contribution to this strategy's cash
-                self.strategy_cash[strategy_name] += self.monthly_contribution
-                
-                # Record contribution for this strategy
-                self.strategy_contributions[strategy_name].append({
-                    'Date': date,
-                    'amount': self.monthly_contribution,
-                    'cumulative': (self.initial_amount + 
-                                 len(self.strategy_contributions[strategy_name]) * 
-                                 self.monthly_contribution)
-                })
-                
-                # Also record in overall contributions (only once per month)
-                if len(self.contributions) == 0 or date > self.contributions[-1]['Date']:
-                    self.contributions.append({
-                        'Date': date,
-                        'amount': self.monthly_contribution,
-                        'cumulative': (self.initial_amount + 
-                                     len(self.contributions) * 
+    def _record_contribution(self, records: dict, date: datetime) -> None:
+        """Append one monthly contribution to column-oriented records"""
+        records['cumulative'].append(self.initial_amount +
+                                     len(records['Date']) *
                                      self.monthly_contribution)
-                    })
-                
-                self.last_contribution_dates[strategy_name] = date
+        records['Date'].append(date)
+        records['amount'].append(self.monthly_contribution)
+
+    def add_monthly_contribution(self, date: datetime, deferred_sid: Optional[int] = None) -> np.ndarray:
+        """
+        Add monthly contribution to each strategy independently
+        
+        Args:
+            date: Contribution date
+            deferred_sid: Strategy id whose contribution is recorded without
+                touching its cash, for callers that add the cash themselves
+            
+        Returns:
+            np.ndarray: Boolean mask of the strategies due a contribution on
+            this date, including deferred_sid although its cash is untouched
+        """
+        # Strategies need a contribution if they were last funded in an earlier month
+        month_id = date.year * 12 + date.month - 1
+        due = self.last_contribution_months < month_id
+        if not due.any():
+            return due
+        
+        # Add contribution to the cash of every due strategy at once
+        cash_due = due.copy()
+        if deferred_sid is not None:
+            cash_due[deferred_sid] = False
+        self.strategy_cash[cash_due] += self.monthly_contribution
+        self.last_contribution_months[due] = month_id
+        
+        # Record contribution for each due strategy
+        for sid in np.flatnonzero(due):
+            self._record_contribution(self.strategy_contributions[self.strategy_names[sid]], date)
+        
+        # Also record in overall contributions (only once per month)
+        overall_dates = self.contributions['Date']
+        if len(overall_dates) == 0 or date > overall_dates[-1]:
+            self._record_contribution(self.contributions, date)
+        return due
+
+    def get_strategy_state(self, strategy_name: str) -> dict:
+        """
+        Export the state of one strategy, e.g. to send it between processes
+        
+        Args:
+            strategy_name: Strategy identifier
+            
+        Returns:
+            dict: Position, cash and contribution records for the strategy
+        """
+        sid = self.strategy_ids[strategy_name]
+        return {
+            'position': self.positions[sid],
+            'cash': self.strategy_cash[sid],
+            'strategy_contributions': self.strategy_contributions[strategy_name],
+            'last_contribution_month': self.last_contribution_months[sid],
+            'contributions': self.contributions
+        }
+
+    def merge_strategy(self, strategy_name: str, state: dict) -> int:
+        """
+        Merge a strategy exported by get_strategy_state into this portfolio
+        
+        Args:
+            strategy_name: Strategy identifier
+            state: Strategy state returned by get_strategy_state
+            
+        Returns:
+            int: Strategy id of the merged strategy
+        """
+        sid = self.initialize_strategy(strategy_name)
+        self.positions[sid] = state['position']
+        self.strategy_cash[sid] = state['cash']
+        self.strategy_contributions[strategy_name] = state['strategy_contributions']
+        self.last_contribution_months[sid] = state['last_contribution_month']
+        
+        # Overall contributions are recorded once per month across all strategies
+        for date in state['contributions']['Date']:
+            overall_dates = self.contributions['Date']
+            if len(overall_dates) == 0 or date > overall_dates[-1]:
+                self._record_contribution(self.contributions, date)
+        return sid
 
-    def calculate_value(self, current_price: float, strategy_name: str) -> float:
+    def calculate_value(self, current_price: float, sid: int) -> float:
         """
         Calculate total value for a strategy including both positions and cash
         
         Args:
             current_price: Current asset price
-            strategy_name: Strategy identifier
+            sid: Strategy id returned by initialize_strategy
         
         Returns:
             float: Total value (position value + remaining cash)
         """
-        if strategy_name not in self.positions:
-            raise ValueError(f"Strategy {strategy_name} not initialized")
+        self._check_strategy_id(sid)
             
         # Calculate position value
-        position_value = self.positions[strategy_name] * current_price
+        position_value = self.positions[sid] * current_price
         
         # Add remaining cash
-        total_value = position_value + self.strategy_cash[strategy_name]
+        total_value = position_value + self.strategy_cash[sid]
         
-        logger.debug(
-            f"Strategy: {strategy_name} - "
-            f"Position Value: {position_value:.2f}, "
-            f"Cash: {self.strategy_cash[strategy_name]:.2f}, "
-            f"Total: {total_value:.2f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Strategy: {self.strategy_names[sid]} - "
+                f"Position Value: {position_value:.2f}, "
+                f"Cash: {self.strategy_cash[sid]:.2f}, "
+                f"Total: {total_value:.2f}"
+            )
         
         return total_value
 
+    @staticmethod
+    def _contributions_to_frame(records: dict) -> pd.DataFrame:
+        """Build a Date-indexed DataFrame from column-oriented records"""
+        return pd.DataFrame(
+            {'amount': records['amount'], 'cumulative': records['cumulative']},
+            index=pd.DatetimeIndex(records['Date'], name='Date')
+        )
+
     def get_contribution_history(self) -> pd.DataFrame:
         """Get contribution history as DataFrame"""
-        if not self.contributions:
+        if not self.contributions['Date']:
             return pd.DataFrame(columns=['Date', 'amount', 'cumulative'])
             
-        df = pd.DataFrame(self.contributions)
-        df['Date'] = pd.to_datetime(df['Date'])
-        df.set_index('Date', inplace=True)
-        return df
+        return self._contributions_to_frame(self.contributions)
 
     def get_strategy_contribution_history(self, strategy_name: str) -> pd.DataFrame:
         """Get contribution history for a specific strategy"""
         if strategy_name not in self.strategy_contributions:
             return pd.DataFrame(columns=['Date', 'amount', 'cumulative'])
             
-        df = pd.DataFrame(self.strategy_contributions[strategy_name])
-        df['Date'] = pd.to_datetime(df['Date'])
-        df.set_index('Date', inplace=True)
-        return df
\ No newline at end of file
+        return self._contributions_to_frame(self.strategy_contributions[strategy_name])
\ No newline at end of file
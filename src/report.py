@@ -5,16 +5,16 @@ def generate_markdown_report(portfolio, metrics, plot_filename="portfolio_analys
     """Generate a markdown report with metrics and embedded plot"""
     
     # Create markdown content
-    report = f"""# Portfolio Analysis Report
+    parts = [f"""# Portfolio Analysis Report
 Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 ## Performance Metrics
 
-### Strategy Performance Summary"""
+### Strategy Performance Summary"""]
     
     # Add metrics for each strategy
     for strategy in metrics:
-        report += f"""
+        parts.append(f"""
 
 ### Strategy: {strategy}
 - Total Cash Contributions: ${metrics[strategy]['total_contributions']:,.2f}
@@ -23,13 +23,14 @@ Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 - Sharpe Ratio: {metrics[strategy]['sharpe_ratio']:.2f}
 - Time-weighted CAGR: {metrics[strategy]['cagr']:.2%}
 - Maximum Drawdown: {metrics[strategy]['max_drawdown']:.2%}
-"""
+""")
 
     # Add plot reference
-    report += f"""
+    parts.append(f"""
 ## Portfolio Analysis Charts
 ![Portfolio Analysis]({plot_filename})
-"""
+""")
+    report = "".join(parts)
     
     # Write report to file
     try:
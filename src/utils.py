@@ -1,4 +1,7 @@
 from pathlib import Path
+from functools import lru_cache
+import re
+import numpy as np
 import pandas as pd
 from typing import Union, Optional
 from datetime import datetime
@@ -11,9 +14,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+try:
+    import pyarrow as pa  # Enables pandas' pyarrow CSV engine and Arrow CSV writing
+    import pyarrow.csv as pacsv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Max invalid row labels listed in validate_data errors
+MAX_REPORTED_ROWS = 20
+
+# Output directories already created by save_to_csv in this process
+_MKDIR_CACHE = set()
+
+# Dates like 2024-01-31 or 2024-01-31T09:30:00 can use pandas' ISO8601 fast path
+ISO_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$')
+
+# Epoch timestamps that a reader left as text, e.g. 1672531200 or 1672531200.0
+EPOCH_PATTERN = re.compile(r'^-?\d+(\.\d*)?$')
+
 def read_csv(file_path: Union[str, Path], 
              date_column: str = 'Date',
-             parse_dates: bool = True) -> pd.DataFrame:
+             parse_dates: bool = True,
+             date_format: Optional[str] = None,
+             chunksize: Optional[int] = None,
+             engine: str = 'c',
+             downcast: bool = False,
+             dtype: Optional[dict] = None,
+             cache: bool = False,
+             unit: str = 's') -> pd.DataFrame:
     """
     Read CSV file with error handling and date parsing
     
@@ -21,48 +50,223 @@ def read_csv(file_path: Union[str, Path],
         file_path: Path to CSV file
         date_column: Name of date column
         parse_dates: Whether to parse dates
+        date_format: strftime format of the date column, inferred if None
+        chunksize: Rows per chunk to read large files in pieces, whole file if None
+        engine: CSV parser, 'c' or 'pyarrow' (falls back to 'c' without pyarrow)
+        downcast: Whether to store floats as float32 (loses precision) and
+            integers in the smallest fitting dtype
+        dtype: Column dtypes passed straight to pandas' CSV reader
+        cache: Whether to keep the parsed DataFrame, keyed by path, modification
+            time and size, so reading the unchanged file again with the same
+            options skips parsing; ignored when chunksize is given
+        unit: Epoch unit ('s', 'ms', 'us', 'ns') for integer date columns
         
     Returns:
         DataFrame from CSV file
     """
     try:
-        file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-            
-        df = pd.read_csv(file_path)
+        if not isinstance(file_path, Path):
+            file_path = Path(file_path)
+        # Chunked reads are meant for files too large to keep around
+        if not cache or chunksize is not None:
+            return _parse_csv(str(file_path), date_column, parse_dates, date_format,
+                              chunksize, engine, downcast, dtype, unit)
         
-        if parse_dates and date_column in df.columns:
-            df = process_dates(df, date_column)
-            
-        return df
+        # stat() raises FileNotFoundError for missing files; no separate exists() check
+        stat = file_path.stat()
+        df = _read_csv_cached(
+            str(file_path.resolve()), stat.st_mtime_ns, stat.st_size,
+            date_column, parse_dates, date_format, engine, downcast,
+            tuple(sorted(dtype.items())) if dtype else None, unit
+        )
+        # The cached DataFrame is shared by later reads, so callers get their own copy
+        return df.copy()
         
     except Exception as e:
-        logger.error(f"Error reading CSV file {file_path}: {str(e)}")
+        logger.error("Error reading CSV file %s: %s", file_path, e)
         raise
 
+@lru_cache(maxsize=32)
+def _read_csv_cached(path: str,
+                     mtime_ns: int,
+                     size: int,
+                     date_column: str,
+                     parse_dates: bool,
+                     date_format: Optional[str],
+                     engine: str,
+                     downcast: bool,
+                     dtype: Optional[tuple],
+                     unit: str) -> pd.DataFrame:
+    """Parse a whole CSV file once per version; mtime_ns and size only key the cache"""
+    return _parse_csv(path, date_column, parse_dates, date_format,
+                      None, engine, downcast, dict(dtype) if dtype else None, unit)
+
+def _parse_csv(path: str,
+               date_column: str,
+               parse_dates: bool,
+               date_format: Optional[str],
+               chunksize: Optional[int],
+               engine: str,
+               downcast: bool,
+               dtype: Optional[dict],
+               unit: str) -> pd.DataFrame:
+    """Parse a CSV file and optionally its date column"""
+    if engine == 'pyarrow' and not HAS_PYARROW:
+        logger.warning("pyarrow is not installed, falling back to the C CSV engine")
+        engine = 'c'
+    if engine == 'pyarrow' and chunksize is not None:
+        logger.warning("pyarrow engine does not support chunksize, using the C CSV engine")
+        engine = 'c'
+    
+    read_kwargs = {'engine': engine, 'dtype': dtype}
+    
+    if parse_dates:
+        # Parse dates in the CSV reader itself; columns it leaves unparsed,
+        # such as epoch numbers, are converted by process_dates
+        read_kwargs.update(parse_dates=[date_column],
+                           date_format=date_format or 'ISO8601',
+                           cache_dates=True)
+    
+    try:
+        df = _read_csv_file(path, chunksize, **read_kwargs)
+    except (ValueError, KeyError):
+        # Readers raise these when the date column is missing; such files are read as they are
+        if not parse_dates:
+            raise
+        df = _read_csv_file(path, chunksize, engine=engine, dtype=dtype)
+        if date_column in df.columns:
+            raise
+        parse_dates = False
+    
+    if downcast:
+        df = downcast_numeric(df)
+    if parse_dates:
+        df = process_dates(df, date_column, date_format, unit)
+        
+    return df
+
+def _read_csv_file(file_path: Union[str, Path], chunksize: Optional[int] = None, **kwargs) -> pd.DataFrame:
+    """Read a CSV in one go, or chunk by chunk when chunksize is given"""
+    if chunksize is None:
+        return pd.read_csv(file_path, **kwargs)
+    with pd.read_csv(file_path, chunksize=chunksize, **kwargs) as reader:
+        return pd.concat(reader, ignore_index=True)
+
+def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store float64 columns as float32 and shrink integer columns to the
+    smallest dtype holding their values
+    
+    The float cast loses precision: float32 keeps about 7 significant digits,
+    so e.g. 9224.52 is stored as 9224.51953125. Integer downcasting is exact.
+    
+    Args:
+        df: Input DataFrame, modified in place
+        
+    Returns:
+        DataFrame with downcast numeric columns
+    """
+    # Cast explicitly so the dtype does not depend on the values in the file
+    for col in df.select_dtypes(np.float64).columns:
+        df[col] = df[col].astype(np.float32)
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+def _detect_date_format(dates: pd.Series) -> Optional[str]:
+    """Return 'ISO8601' if the first non-null value is an ISO date, else None"""
+    first_valid = dates.first_valid_index()
+    if first_valid is not None and ISO_DATE_PATTERN.match(str(dates[first_valid])):
+        return 'ISO8601'
+    return None
+
+def _epoch_values(dates: pd.Series) -> Optional[pd.Series]:
+    """
+    Return the date column as epoch numbers, or None if it holds anything else
+    
+    Gaps turn integer columns into floats, and readers may leave numbers as
+    text, so whole numbers come back as int64 or, with gaps, nullable Int64.
+    """
+    if not pd.api.types.is_numeric_dtype(dates):
+        first_valid = dates.first_valid_index()
+        if first_valid is None or not EPOCH_PATTERN.match(str(dates[first_valid])):
+            return None
+        numbers = pd.to_numeric(dates, errors='coerce', dtype_backend='numpy_nullable')
+        if numbers.count() != dates.count():
+            return None  # Not all numbers; let the date parser report the bad values
+        dates = numbers
+    if pd.api.types.is_float_dtype(dates):
+        values = dates.to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.all(np.isnan(values) | (values == np.floor(values))):
+            dates = dates.astype('Int64')
+    if pd.api.types.is_integer_dtype(dates) and dates.dtype != np.int64 and not dates.hasnans:
+        # int64 takes pandas' vectorized path; unsigned and nullable ints do not
+        dates = dates.astype(np.int64)
+    return dates
+
 def process_dates(df: pd.DataFrame, 
-                 date_column: str = 'Date') -> pd.DataFrame:
+                 date_column: str = 'Date',
+                 date_format: Optional[str] = None,
+                 unit: str = 's') -> pd.DataFrame:
     """
     Process date column in DataFrame
     
+    The date column is converted and the rows sorted in place, so no second
+    DataFrame is allocated. Pass df.copy() to keep the original untouched.
+    
     Args:
-        df: Input DataFrame
+        df: Input DataFrame, modified in place
         date_column: Name of date column
+        date_format: strftime format of the date column, inferred if None
+        unit: Epoch unit ('s', 'ms', 'us', 'ns') used when the date column holds
+            numbers, or numeric text and date_format is None
         
     Returns:
-        DataFrame with processed dates
+        The same DataFrame with processed dates and a RangeIndex
     """
     try:
-        df[date_column] = pd.to_datetime(df[date_column])
-        return df.sort_values(by=date_column).reset_index(drop=True)
+        dates = df[date_column]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            # An explicit date_format still applies to numeric text such as 20230101
+            epochs = None
+            if date_format is None or pd.api.types.is_numeric_dtype(dates):
+                epochs = _epoch_values(dates)
+            if epochs is not None:
+                df[date_column] = pd.to_datetime(epochs, unit=unit, cache=True)
+            else:
+                if date_format is None:
+                    date_format = _detect_date_format(dates)
+                df[date_column] = pd.to_datetime(dates, format=date_format, cache=True)
+        # Time series files are usually sorted already; then only the index needs resetting
+        if df[date_column].is_monotonic_increasing:
+            df.index = pd.RangeIndex(len(df))
+        else:
+            df.sort_values(by=date_column, inplace=True, kind='mergesort', ignore_index=True)
+        return df
     except Exception as e:
-        logger.error(f"Error processing dates: {str(e)}")
+        logger.error("Error processing dates: %s", e)
         raise
 
+def _write_csv_file(df: pd.DataFrame, file_path: Path, index: bool,
+                    chunksize: Optional[int], backend: str) -> None:
+    """Write a DataFrame with pandas or with Arrow's C++ CSV writer"""
+    if backend == 'arrow':
+        if index:
+            # Write the index as the leading column(s) like pandas, which leaves
+            # an unnamed index's header empty
+            unnamed = df.index.nlevels == 1 and df.index.name is None
+            df = df.reset_index(names='' if unnamed else None)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        options = pacsv.WriteOptions(batch_size=chunksize) if chunksize else None
+        pacsv.write_csv(table, str(file_path), write_options=options)
+    else:
+        df.to_csv(file_path, index=index, chunksize=chunksize)
+
 def save_to_csv(df: pd.DataFrame, 
                 file_path: Union[str, Path], 
-                index: bool = False) -> None:
+                index: bool = False,
+                chunksize: Optional[int] = None,
+                backend: str = 'pandas') -> None:
     """
     Save DataFrame to CSV with error handling
     
@@ -70,14 +274,32 @@ def save_to_csv(df: pd.DataFrame,
         df: DataFrame to save
         file_path: Path to save CSV
         index: Whether to save index
+        chunksize: Rows to write at a time, pandas' default if None
+        backend: CSV writer, 'pandas' or 'arrow' (falls back to 'pandas' without pyarrow)
     """
     try:
-        file_path = Path(file_path)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(file_path, index=index)
-        logger.info(f"Successfully saved CSV to {file_path}")
+        if not isinstance(file_path, Path):
+            file_path = Path(file_path)
+        parent = file_path.parent
+        if parent not in _MKDIR_CACHE:
+            parent.mkdir(parents=True, exist_ok=True)
+            _MKDIR_CACHE.add(parent)
+        if backend == 'arrow' and not HAS_PYARROW:
+            logger.warning("pyarrow is not installed, falling back to pandas CSV writer")
+            backend = 'pandas'
+        try:
+            _write_csv_file(df, file_path, index, chunksize, backend)
+        except OSError:
+            # Directory was removed since it was cached; create it again once
+            if parent.exists():
+                raise
+            _MKDIR_CACHE.discard(parent)
+            parent.mkdir(parents=True, exist_ok=True)
+            _MKDIR_CACHE.add(parent)
+            _write_csv_file(df, file_path, index, chunksize, backend)
+        logger.info("Successfully saved CSV to %s", file_path)
     except Exception as e:
-        logger.error(f"Error saving CSV to {file_path}: {str(e)}")
+        logger.error("Error saving CSV to %s: %s", file_path, e)
         raise
 
 def validate_data(df: pd.DataFrame, 
@@ -95,19 +317,34 @@ def validate_data(df: pd.DataFrame,
         bool: True if validation passes
     """
     try:
-        # Check required columns
-        missing_cols = [col for col in required_columns if col not in df.columns]
-        if missing_cols:
+        # Check required columns with one vectorized hash lookup (-1 = not present);
+        # get_indexer needs unique labels, so duplicated columns use a set instead
+        if df.columns.is_unique:
+            missing_mask = df.columns.get_indexer(required_columns) == -1
+        else:
+            existing_cols = set(df.columns)
+            missing_mask = np.array([col not in existing_cols for col in required_columns], dtype=bool)
+        if missing_mask.any():
+            missing_cols = [required_columns[i] for i in np.flatnonzero(missing_mask)]
             raise ValueError(f"Missing required columns: {missing_cols}")
             
         # Validate date column
         if date_column in df.columns:
-            invalid_dates = df[~pd.to_datetime(df[date_column], errors='coerce').notna()]
-            if not invalid_dates.empty:
-                raise ValueError(f"Invalid dates found in rows: {invalid_dates.index.tolist()}")
+            dates = df[date_column]
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                # Only string/object columns need parsing; coerce bad values to NaT
+                dates = pd.to_datetime(dates, errors='coerce',
+                                       format=_detect_date_format(dates),
+                                       cache=True)
+            # Typed columns are already parsed, so only missing values can be invalid
+            invalid_rows = np.flatnonzero(dates.isna().to_numpy())
+            if invalid_rows.size:
+                shown = df.index[invalid_rows[:MAX_REPORTED_ROWS]].tolist()
+                more = "..." if invalid_rows.size > MAX_REPORTED_ROWS else ""
+                raise ValueError(f"Invalid dates found in rows: {shown}{more}")
                 
         return True
         
     except Exception as e:
-        logger.error(f"Data validation failed: {str(e)}")
+        logger.error("Data validation failed: %s", e)
         raise
\ No newline at end of file
@@ -4,38 +4,44 @@ import numpy as np
 from datetime import datetime
 from src.backtester import Backtester
 from src.portfolio import Portfolio
+from src.backtester_kernel import _simulate, _compiled_simulate
 
 class TestBacktester(unittest.TestCase):
-    def setUp(self):
-        """Set up test environment before each test"""
-        self.initial_amount = 10000
-        self.monthly_contribution = 1000
-        self.portfolio = Portfolio(self.initial_amount, self.monthly_contribution)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared, read-only test data once for the class"""
+        cls.initial_amount = 10000
+        cls.monthly_contribution = 1000
         
         # Create sample price data
-        self.prices = pd.DataFrame({
-            'Close': [100.0, 101.0, 102.0, 103.0],
-            'Date': pd.date_range(start='2023-01-01', periods=4, freq='D')
-        }).set_index('Date')
+        cls.prices = pd.DataFrame(
+            {'Close': np.array([100.0, 101.0, 102.0, 103.0], dtype=np.float32)},
+            index=pd.date_range(start='2023-01-01', periods=4, freq='D', name='Date')
+        )
         
+        # Create sample strategy data; run_backtest does not modify it
+        cls.jan_strategy_data = pd.DataFrame({
+            'Date': pd.to_datetime(['2023-01-02']),
+            'Amount': [1000]
+        })
+        cls.feb_strategy_data = pd.DataFrame({
+            'Date': pd.to_datetime(['2023-02-01']),
+            'Amount': [1000]
+        })
+
+    def setUp(self):
+        """Create fresh portfolio state before each test"""
+        self.portfolio = Portfolio(self.initial_amount, self.monthly_contribution)
         self.backtester = Backtester(self.portfolio, self.prices)
 
     def test_strategy_initialization(self):
         """Test strategy initialization"""
-        strategy_data = pd.DataFrame({
-            'Date': ['2023-01-02'],
-            'Amount': [1000]
-        })
-        self.backtester.run_backtest(strategy_data, 'test_strategy')
+        self.backtester.run_backtest(self.jan_strategy_data, 'test_strategy')
         self.assertIn('test_strategy', self.backtester.strategies)
 
     def test_portfolio_value_calculation(self):
         """Test portfolio value calculation with trades"""
-        strategy_data = pd.DataFrame({
-            'Date': ['2023-01-02'],
-            'Amount': [1000]
-        })
-        self.backtester.run_backtest(strategy_data, 'test_strategy')
+        self.backtester.run_backtest(self.jan_strategy_data, 'test_strategy')
         results = self.backtester.get_all_results()
         
         self.assertIn('test_strategy', results)
@@ -43,11 +49,7 @@ class TestBacktester(unittest.TestCase):
 
     def test_monthly_contribution(self):
         """Test monthly contribution handling"""
-        strategy_data = pd.DataFrame({
-            'Date': ['2023-02-01'],
-            'Amount': [1000]
-        })
-        self.backtester.run_backtest(strategy_data, 'test_strategy')
+        self.backtester.run_backtest(self.feb_strategy_data, 'test_strategy')
         results = self.backtester.get_all_results()
         
         # Should include initial amount + monthly contribution
@@ -56,5 +58,121 @@ class TestBacktester(unittest.TestCase):
             self.initial_amount + self.monthly_contribution
         )
 
+    def test_same_day_trades(self):
+        """Test that trades on the same day are summed into one trade"""
+        strategy_data = pd.DataFrame({
+            'Date': pd.to_datetime(['2023-01-02', '2023-01-02']),
+            'Amount': [1000, 500]
+        })
+        self.backtester.run_backtest(strategy_data, 'test_strategy')
+        results = self.backtester.get_strategy_results('test_strategy')
+        
+        # 2023-01-01 is the first of the month, so the contribution is already in cash
+        funded = self.initial_amount + self.monthly_contribution
+        self.assertAlmostEqual(results['cash_values'][-1], funded - 1500)
+        self.assertAlmostEqual(results['position_values'][1], 1500)
+        self.assertAlmostEqual(self.portfolio.positions[0], 1500 / 101.0)
+
+    def test_trade_on_non_trading_day(self):
+        """Test that trades on dates without a price are ignored"""
+        strategy_data = pd.DataFrame({
+            'Date': pd.to_datetime(['2023-01-07']),
+            'Amount': [1000]
+        })
+        self.backtester.run_backtest(strategy_data, 'test_strategy')
+        results = self.backtester.get_strategy_results('test_strategy')
+        
+        np.testing.assert_allclose(results['cash_values'],
+                                   self.initial_amount + self.monthly_contribution)
+        np.testing.assert_allclose(results['position_values'], 0.0)
+
+    def test_insufficient_cash_skips_trade(self):
+        """Test that a trade larger than the available cash is skipped"""
+        strategy_data = pd.DataFrame({
+            'Date': pd.to_datetime(['2023-01-02', '2023-01-03']),
+            'Amount': [20000, 1000]
+        })
+        with self.assertLogs('src.backtester', level='WARNING') as logs:
+            self.backtester.run_backtest(strategy_data, 'test_strategy')
+        results = self.backtester.get_strategy_results('test_strategy')
+        
+        # Only the first trade is skipped; the second still executes
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('2023-01-02', logs.output[0])
+        funded = self.initial_amount + self.monthly_contribution
+        self.assertAlmostEqual(results['cash_values'][1], funded)
+        self.assertAlmostEqual(results['cash_values'][-1], funded - 1000)
+        self.assertAlmostEqual(self.portfolio.positions[0], 1000 / 102.0)
+
+    def test_contribution_booked_once(self):
+        """Test that each monthly contribution is added to cash exactly once"""
+        self.portfolio.initialize_strategy('other_strategy')
+        self.backtester.run_backtest(self.jan_strategy_data, 'test_strategy')
+        results = self.backtester.get_strategy_results('test_strategy')
+        sid = self.portfolio.strategy_ids['test_strategy']
+        
+        funded = self.initial_amount + self.monthly_contribution
+        self.assertAlmostEqual(self.portfolio.strategy_cash[sid], results['cash_values'][-1])
+        self.assertAlmostEqual(self.portfolio.strategy_cash[sid], funded - 1000)
+        self.assertAlmostEqual(self.portfolio.strategy_cash[self.portfolio.strategy_ids['other_strategy']], funded)
+        self.assertEqual(len(self.portfolio.strategy_contributions['test_strategy']['Date']), 1)
+
+    def test_merge_strategy(self):
+        """Test that strategies backtested in separate portfolios merge into one"""
+        for name, strategy_data in [('jan', self.jan_strategy_data), ('feb', self.feb_strategy_data)]:
+            worker = Portfolio(self.initial_amount, self.monthly_contribution)
+            worker_backtester = Backtester(worker, self.prices)
+            worker_backtester.run_backtest(strategy_data, name)
+            self.backtester.merge_strategy(name, worker_backtester.get_strategy_results(name))
+            self.portfolio.merge_strategy(name, worker.get_strategy_state(name))
+        
+        self.assertEqual(list(self.backtester.get_all_results()), ['jan', 'feb'])
+        self.assertEqual(self.portfolio.strategy_names, ['jan', 'feb'])
+        self.assertAlmostEqual(self.portfolio.positions[0], 1000 / 101.0)
+        self.assertAlmostEqual(self.portfolio.strategy_cash[1], self.initial_amount + self.monthly_contribution)
+        
+        # The shared month is recorded once in the overall contributions
+        history = self.portfolio.get_contribution_history()
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history['cumulative'].iloc[0], self.initial_amount)
+
+    def test_merge_strategy_rejects_other_trading_days(self):
+        """Test that results on a different calendar are not merged"""
+        worker = Backtester(Portfolio(self.initial_amount, self.monthly_contribution), self.prices.iloc[1:])
+        worker.run_backtest(self.jan_strategy_data, 'test_strategy')
+        
+        with self.assertRaises(ValueError):
+            self.backtester.merge_strategy('test_strategy', worker.get_strategy_results('test_strategy'))
+
+    def test_portfolio_logs_strategy_name(self):
+        """Test that portfolio debug messages name the strategy rather than its id"""
+        sid = self.portfolio.initialize_strategy('test_strategy')
+        with self.assertLogs('src.portfolio', level='DEBUG') as logs:
+            self.portfolio.execute_trade(1000, datetime(2023, 1, 2), sid, 100.0)
+            self.portfolio.calculate_value(101.0, sid)
+        
+        self.assertEqual(len(logs.output), 2)
+        for message in logs.output:
+            self.assertIn('test_strategy', message)
+
+class TestKernel(unittest.TestCase):
+    @unittest.skipIf(_compiled_simulate() is None, "numba is not installed")
+    def test_compiled_matches_python(self):
+        """Test that the numba-compiled kernel matches the Python loop"""
+        n_days = 100
+        rng = np.random.default_rng(0)
+        close = 100 + rng.random(n_days)
+        is_first_of_month = np.zeros(n_days, dtype=bool)
+        is_first_of_month[::21] = True
+        trade_amount = np.zeros(n_days)
+        trade_amount[::5] = 3000.0
+        args = (close, is_first_of_month, is_first_of_month, trade_amount, trade_amount > 0,
+                10000.0, 0.0, 10000.0, 1000.0)
+        
+        expected = _simulate(*args)
+        actual = _compiled_simulate()(*args)
+        for a, e in zip(actual, expected):
+            np.testing.assert_allclose(a, e)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+from src.metrics import PerformanceMetrics
+
+class TestSolveIrr(unittest.TestCase):
+    def test_known_irr(self):
+        """Test IRRs of cashflows with a single known rate"""
+        cases = [
+            ([-100.0, 110.0], 0.1),
+            ([-100.0, 0.0, 121.0], 0.1),
+            ([-100.0, -100.0, 231.0], 0.1),
+            ([-100.0, 50.0], -0.5),
+            ([-1000.0, 0.0, 0.0, 1000.0], 0.0),
+        ]
+        for cashflows, expected in cases:
+            with self.subTest(cashflows=cashflows):
+                self.assertAlmostEqual(PerformanceMetrics._solve_irr(np.array(cashflows)), expected)
+
+    def test_nan_cases(self):
+        """Test cashflows without a single IRR inside the bracket"""
+        cases = [
+            [-100.0, 230.0, -132.0],  # IRRs of 0.1 and 0.2
+            [-100.0, 0.5],            # IRR of -0.995, below the bracket
+            [-100.0, -50.0],          # Never breaks even
+        ]
+        for cashflows in cases:
+            with self.subTest(cashflows=cashflows):
+                self.assertTrue(np.isnan(PerformanceMetrics._solve_irr(np.array(cashflows))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+import pandas as pd
+import numpy as np
+from src.utils import (save_to_csv, read_csv, process_dates, downcast_numeric, validate_data,
+                       _read_csv_cached, HAS_PYARROW, MAX_REPORTED_ROWS)
+
+class TestSaveToCsv(unittest.TestCase):
+    def setUp(self):
+        """Create a scratch directory and a small Date-indexed frame"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.dir = Path(self.tmp_dir.name)
+        self.prices = pd.DataFrame(
+            {'Close': [100.0, 101.5, 102.25]},
+            index=pd.date_range(start='2023-01-01', periods=3, freq='D', name='Date')
+        )
+
+    def _round_trip(self, df, index, backend):
+        """Write df with the given backend and read it back with pandas"""
+        path = self.dir / f'{backend}_{index}.csv'
+        save_to_csv(df, path, index=index, backend=backend)
+        return pd.read_csv(path)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_backends_write_same_frame(self):
+        """Test that the pandas and Arrow writers produce the same columns and values"""
+        frames = {
+            'named index': self.prices,
+            'unnamed index': self.prices.reset_index(),
+        }
+        for label, df in frames.items():
+            for index in (False, True):
+                with self.subTest(frame=label, index=index):
+                    expected = self._round_trip(df, index, 'pandas')
+                    actual = self._round_trip(df, index, 'arrow')
+                    self.assertEqual(list(actual.columns), list(expected.columns))
+                    if 'Date' in expected:
+                        # Arrow writes timestamps with a time part; compare parsed dates
+                        expected['Date'] = pd.to_datetime(expected['Date'])
+                        actual['Date'] = pd.to_datetime(actual['Date'])
+                    pd.testing.assert_frame_equal(actual, expected)
+
+    def test_recreates_removed_directory(self):
+        """Test that a cached output directory is recreated after it was removed"""
+        out_dir = self.dir / 'reports'
+        save_to_csv(self.prices, out_dir / 'first.csv', index=True)
+        shutil.rmtree(out_dir)
+        save_to_csv(self.prices, out_dir / 'second.csv', index=True)
+        
+        self.assertFalse((out_dir / 'first.csv').exists())
+        self.assertEqual(len(pd.read_csv(out_dir / 'second.csv')), len(self.prices))
+
+class TestReadCsv(unittest.TestCase):
+    def setUp(self):
+        """Write a small price file to a scratch directory"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = Path(self.tmp_dir.name) / 'prices.csv'
+        self.path.write_text('Date,Close\n2023-01-01,100.0\n2023-01-02,101.0\n')
+
+    def test_cache_invalidated_when_file_changes(self):
+        """Test that a cached read is redone after the file is rewritten"""
+        first = read_csv(self.path, cache=True)
+        self.path.write_text('Date,Close\n2023-01-01,100.0\n2023-01-02,101.0\n2023-01-03,102.5\n')
+        second = read_csv(self.path, cache=True)
+        
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 3)
+        self.assertEqual(second['Close'].iloc[-1], 102.5)
+
+    def test_cached_frame_not_shared(self):
+        """Test that modifying a returned frame does not change later reads"""
+        first = read_csv(self.path, cache=True)
+        first.loc[0, 'Close'] = 99.0
+        
+        self.assertEqual(read_csv(self.path, cache=True).loc[0, 'Close'], 100.0)
+
+    def test_uncached_reads(self):
+        """Test that plain and chunked reads bypass the cache"""
+        _read_csv_cached.cache_clear()
+        plain = read_csv(self.path)
+        chunked = read_csv(self.path, chunksize=1, cache=True)
+        
+        self.assertEqual(_read_csv_cached.cache_info().currsize, 0)
+        pd.testing.assert_frame_equal(plain, chunked)
+
+    def test_single_parse(self):
+        """Test that dates are parsed while reading, without a second read of the file"""
+        with mock.patch('pandas.read_csv', wraps=pd.read_csv) as reader:
+            df = read_csv(self.path, dtype={'Close': 'float32'})
+        
+        self.assertEqual(reader.call_count, 1)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['Date']))
+        self.assertEqual(df['Close'].dtype, np.float32)
+
+    def test_missing_date_column(self):
+        """Test that files without the date column are read as they are"""
+        self.path.write_text('Close\n100.0\n101.0\n')
+        df = read_csv(self.path)
+        
+        self.assertEqual(list(df.columns), ['Close'])
+        self.assertEqual(len(df), 2)
+
+class TestEpochDates(unittest.TestCase):
+    def setUp(self):
+        """Create a scratch directory for the CSV files"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.dir = Path(self.tmp_dir.name)
+        self.expected = pd.to_datetime(['2023-01-01', '2023-01-02'])
+
+    def _read(self, text, **kwargs):
+        """Write text to a CSV file and read it back"""
+        path = self.dir / 'epochs.csv'
+        path.write_text(text)
+        return read_csv(path, **kwargs)
+
+    def test_epoch_seconds(self):
+        """Test integer epoch dates without gaps"""
+        df = self._read('Date,Close\n1672531200,1\n1672617600,2\n')
+        self.assertEqual(df['Date'].tolist(), self.expected.tolist())
+
+    def test_epoch_unit(self):
+        """Test that unit is applied to epoch dates"""
+        df = self._read('Date,Close\n1672531200000,1\n1672617600000,2\n', unit='ms')
+        self.assertEqual(df['Date'].tolist(), self.expected.tolist())
+
+    def test_epoch_with_gap(self):
+        """Test epoch dates with an empty value, which readers return as floats"""
+        for text in ('Date,Close\n1672531200,1\n,2\n', 'Date,Close\n,2\n1672531200,1\n'):
+            with self.subTest(text=text):
+                df = self._read(text)
+                self.assertEqual(df['Date'].iloc[0], self.expected[0])
+                self.assertTrue(pd.isna(df['Date'].iloc[1]))
+
+    def test_nullable_and_text_epochs(self):
+        """Test nullable integer and numeric text epoch columns"""
+        columns = [
+            pd.array([1672531200, None], dtype='Int64'),
+            pd.Series(['1672531200', None], dtype=object),
+            pd.Series(['1672531200000000000', None], dtype=object),
+        ]
+        units = ['s', 's', 'ns']
+        for dates, unit in zip(columns, units):
+            with self.subTest(dtype=str(dates.dtype), unit=unit):
+                df = process_dates(pd.DataFrame({'Date': dates}), unit=unit)
+                self.assertEqual(df['Date'].iloc[0], self.expected[0])
+                self.assertTrue(pd.isna(df['Date'].iloc[1]))
+
+    def test_numeric_text_with_format(self):
+        """Test that an explicit date_format wins over epoch conversion for text"""
+        df = process_dates(pd.DataFrame({'Date': ['20230101', '20230102']}), date_format='%Y%m%d')
+        self.assertEqual(df['Date'].tolist(), self.expected.tolist())
+
+class TestDowncastNumeric(unittest.TestCase):
+    def test_float_columns_become_float32(self):
+        """Test that floats are cast to float32 whether or not they round-trip"""
+        # pd.to_numeric(downcast='float') kept 17659.38 as float64 but not 9224.52
+        for values in ([9224.52, 8873.03], [17659.38], [0.5, 1.25]):
+            with self.subTest(values=values):
+                df = downcast_numeric(pd.DataFrame({'Close': values}))
+                self.assertEqual(df['Close'].dtype, np.float32)
+                np.testing.assert_array_equal(df['Close'].to_numpy(), np.array(values, dtype=np.float32))
+
+    def test_integer_columns_shrink_exactly(self):
+        """Test that integers use the smallest dtype holding their values"""
+        df = downcast_numeric(pd.DataFrame({'small': [1, 2], 'large': [1, 2 ** 40]}))
+        self.assertEqual(df['small'].dtype, np.int8)
+        self.assertEqual(df['large'].dtype, np.int64)
+        self.assertEqual(df['large'].iloc[1], 2 ** 40)
+
+class TestValidateData(unittest.TestCase):
+    def setUp(self):
+        """Create a valid frame with typed dates"""
+        self.df = pd.DataFrame({
+            'Date': pd.date_range(start='2023-01-01', periods=3, freq='D'),
+            'Close': [100.0, 101.0, 102.0]
+        })
+
+    def test_valid_frame(self):
+        """Test that a complete frame with valid dates passes"""
+        self.assertTrue(validate_data(self.df, ['Date', 'Close']))
+
+    def test_missing_columns_in_requested_order(self):
+        """Test that missing columns are reported in the order they were requested"""
+        with self.assertRaisesRegex(ValueError, r"\['Volume', 'Amount'\]"):
+            validate_data(self.df, ['Volume', 'Date', 'Amount'])
+
+    def test_duplicate_columns(self):
+        """Test the set-based column check used when column labels repeat"""
+        df = pd.concat([self.df, self.df[['Close']]], axis=1)
+        self.assertFalse(df.columns.is_unique)
+        self.assertTrue(validate_data(df, ['Date', 'Close']))
+        with self.assertRaisesRegex(ValueError, r"\['Amount'\]"):
+            validate_data(df, ['Close', 'Amount'])
+
+    def test_typed_dates_with_nat(self):
+        """Test that a datetime64 column only fails on missing values"""
+        df = self.df.set_index(pd.Index(['a', 'b', 'c']))
+        df.loc['b', 'Date'] = pd.NaT
+        with self.assertRaisesRegex(ValueError, r"rows: \['b'\]$"):
+            validate_data(df, ['Date'])
+
+    def test_string_dates(self):
+        """Test that unparseable string dates are reported by row label"""
+        df = pd.DataFrame({'Date': ['2023-01-01', 'not a date', '2023-01-03']})
+        with self.assertRaisesRegex(ValueError, r"rows: \[1\]$"):
+            validate_data(df, ['Date'])
+
+    def test_reported_rows_truncated(self):
+        """Test that at most MAX_REPORTED_ROWS invalid rows are listed"""
+        for n_invalid, suffix in ((MAX_REPORTED_ROWS, ''), (MAX_REPORTED_ROWS + 5, '...')):
+            with self.subTest(n_invalid=n_invalid):
+                df = pd.DataFrame({'Date': pd.Series([pd.NaT] * n_invalid, dtype='datetime64[ns]')})
+                with self.assertRaises(ValueError) as ctx:
+                    validate_data(df, ['Date'])
+                expected = f"{list(range(MAX_REPORTED_ROWS))}{suffix}"
+                self.assertTrue(str(ctx.exception).endswith(expected))
+
+if __name__ == '__main__':
+    unittest.main()